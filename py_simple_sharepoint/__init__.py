@@ -1,16 +1,43 @@
 import os
 import base64
 import json
+import copy
 import uuid
+import mmap
 import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography import x509
 from pathlib import Path
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+GRAPH_URL = "https://graph.microsoft.com/v1.0"
 
 
 class SharePointClient:
+    # Access tokens shared across instances: (tenant_id, client_id, scope) -> (token, expiry)
+    _TOKEN_CACHE = {}
+    # Site/drive ids are stable, so resolve them once per process
+    _SITE_CACHE = {}
+    _DRIVE_CACHE = {}
+    # Maximum number of sub-requests Graph accepts in one $batch call
+    BATCH_LIMIT = 20
+    # RS256 signing parameters; both objects are stateless and safe to share
+    _PKCS1 = padding.PKCS1v15()
+    _SHA256 = hashes.SHA256()
+    # Item fields returned by folder listings unless the caller passes `select`
+    DEFAULT_SELECT = (
+        "id", "name", "webUrl", "size", "file", "folder", "parentReference",
+        "createdDateTime", "lastModifiedDateTime", "@microsoft.graph.downloadUrl",
+    )
+    # Largest page size Graph allows for children listings
+    LIST_PAGE_SIZE = 999
+
     def __init__(self, tenant_id, client_id, cert_path, key_path, site_hostname, site_path, library_title, key_password=None):
         self.tenant_id = tenant_id
         self.client_id = client_id
@@ -20,20 +47,49 @@ class SharePointClient:
         self.site_path = site_path
         self.library_title = library_title
         self.key_password = key_password
+        # Recent folder listings: folder_name -> (fetched_at, items)
+        self._listing_cache = {}
+
+        # Pooled sessions (keep-alive + retries on throttling): one for Graph, one for the token endpoint
+        self.session = self._new_session()
+        self._token_session = self._new_session()
 
         self.private_key, self.certificate = self._load_key_and_cert()
+        self._jwt_header_b64 = self._build_jwt_header()
         self.access_token = self._get_access_token()
         self.headers = {"Authorization": f"Bearer {self.access_token}", "Accept": "application/json"}
+        self.session.headers.update(self.headers)
 
         # Resolve site + drive once and cache them
         self.site_id = self._resolve_site()
         self.drive_id = self._resolve_drive()
+        self._drive_url = f"{GRAPH_URL}/drives/{self.drive_id}"
+        self._root_path_url = f"{self._drive_url}/root:"
+
+    def close(self):
+        """Close the underlying HTTP sessions."""
+        self.session.close()
+        self._token_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     # -------------------------
     # Internal helpers
     # -------------------------
-    def _base64url_encode(self, data: bytes) -> str:
-        return base64.urlsafe_b64encode(data).rstrip(b"=").decode("utf-8")
+    @staticmethod
+    def _new_session():
+        session = requests.Session()
+        retries = Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries))
+        return session
+
+    @staticmethod
+    def _base64url_encode(data: bytes) -> str:
+        return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
     def _load_key_and_cert(self):
         # Load private key
@@ -52,17 +108,22 @@ class SharePointClient:
 
         return private_key, certificate
 
-    def _new_jwt_client_assertion(self):
-        aud = f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
-        nbf = int(time.time()) - 60
-        exp = int(time.time()) + 300
-        jti = str(uuid.uuid4())
-
+    def _build_jwt_header(self):
+        # alg/typ/x5t are fixed for the certificate, so encode the header once
         header = {
             "alg": "RS256",
             "typ": "JWT",
             "x5t": self._base64url_encode(self.certificate.fingerprint(hashes.SHA1()))
         }
+        return self._base64url_encode(json.dumps(header, separators=(",", ":")).encode())
+
+    def _new_jwt_client_assertion(self):
+        aud = f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
+        now = int(time.time())
+        nbf = now - 60
+        exp = now + 300
+        jti = uuid.uuid4().hex
+
         payload = {
             "iss": self.client_id,
             "sub": self.client_id,
@@ -72,20 +133,25 @@ class SharePointClient:
             "jti": jti
         }
 
-        header_b64 = self._base64url_encode(json.dumps(header, separators=(",", ":")).encode())
         payload_b64 = self._base64url_encode(json.dumps(payload, separators=(",", ":")).encode())
-        unsigned = f"{header_b64}.{payload_b64}"
+        unsigned = f"{self._jwt_header_b64}.{payload_b64}"
 
         signature = self.private_key.sign(
             unsigned.encode("ascii"),
-            padding.PKCS1v15(),
-            hashes.SHA256()
+            self._PKCS1,
+            self._SHA256
         )
         sig_b64 = self._base64url_encode(signature)
 
         return f"{unsigned}.{sig_b64}"
 
     def _get_access_token(self, scope="https://graph.microsoft.com/.default"):
+        cache_key = (self.tenant_id, self.client_id, scope)
+        cached = self._TOKEN_CACHE.get(cache_key)
+        if cached and time.time() < cached[1]:
+            self._token_expiry = cached[1]
+            return cached[0]
+
         assertion = self._new_jwt_client_assertion()
         body = {
             "client_id": self.client_id,
@@ -95,43 +161,152 @@ class SharePointClient:
             "client_assertion": assertion
         }
         token_endpoint = f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
-        resp = requests.post(token_endpoint, data=body)
+        resp = self._token_session.post(token_endpoint, data=body)
         resp.raise_for_status()
-        return resp.json()["access_token"]
+        token = resp.json()
+
+        # Refresh a minute early so a token never expires mid-request
+        self._token_expiry = time.time() + int(token["expires_in"]) - 60
+        self._TOKEN_CACHE[cache_key] = (token["access_token"], self._token_expiry)
+        return token["access_token"]
+
+    def _refresh_if_needed(self):
+        if time.time() < self._token_expiry:
+            return
+        self.access_token = self._get_access_token()
+        self.headers["Authorization"] = f"Bearer {self.access_token}"
+        self.session.headers["Authorization"] = self.headers["Authorization"]
 
     def _resolve_site(self):
-        site_url = f"https://graph.microsoft.com/v1.0/sites/{self.site_hostname}:{self.site_path}"
-        site = requests.get(site_url, headers=self.headers).json()
+        cache_key = (self.site_hostname, self.site_path)
+        if cache_key in self._SITE_CACHE:
+            return self._SITE_CACHE[cache_key]
+
+        site_url = f"{GRAPH_URL}/sites/{self.site_hostname}:{self.site_path}"
+        site = self.session.get(site_url).json()
         if "id" not in site:
             raise Exception(f"Failed to resolve site id for {self.site_hostname}{self.site_path}")
+        self._SITE_CACHE[cache_key] = site["id"]
         return site["id"]
 
     def _resolve_drive(self):
-        drives_url = f"https://graph.microsoft.com/v1.0/sites/{self.site_id}/drives"
-        drives = requests.get(drives_url, headers=self.headers).json()
+        cache_key = (self.site_id, self.library_title)
+        if cache_key in self._DRIVE_CACHE:
+            return self._DRIVE_CACHE[cache_key]
+
+        drives_url = f"{GRAPH_URL}/sites/{self.site_id}/drives"
+        drives = self.session.get(drives_url).json()
+        if "value" not in drives:
+            # Likely an auth failure; drop any cached site id so the next client re-resolves it
+            self._SITE_CACHE.pop((self.site_hostname, self.site_path), None)
+            raise Exception(f"Failed to list drives for site {self.site_hostname}{self.site_path}")
         drive = next((d for d in drives["value"] if d["name"] == self.library_title), None)
         if not drive:
             raise Exception(f"Drive (library) named '{self.library_title}' not found on site.")
+        self._DRIVE_CACHE[cache_key] = drive["id"]
         return drive["id"]
 
+    def _stream_to_file(self, download_url, local_path, chunk_size=1024*1024):
+        # Download URLs are pre-authenticated, so don't send the bearer token
+        with self.session.get(download_url, headers={"Authorization": None}, stream=True) as resp:
+            resp.raise_for_status()
+            # Write next to the target and swap it in only once the whole body arrived,
+            # so a failed download never clobbers an existing copy
+            # (plain open() so the file gets the usual umask-based permissions)
+            tmp_path = f"{local_path}.part"
+            try:
+                with open(tmp_path, "wb") as f:
+                    for chunk in resp.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                os.replace(tmp_path, local_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+    def _list_params(self, select=None, required=()):
+        # select: None -> DEFAULT_SELECT, "*" -> Graph's full item payload, else field names
+        params = {"$top": str(self.LIST_PAGE_SIZE)}
+        if select == "*":
+            return params
+        if select is None:
+            fields = list(self.DEFAULT_SELECT)
+        else:
+            fields = select.split(",") if isinstance(select, str) else list(select)
+        fields += [field for field in required if field not in fields]
+        params["$select"] = ",".join(fields)
+        return params
+
+    def _list_folder_cached(self, folder_name="", max_age=0, params=None):
+        # Only stores/reuses listings when max_age > 0. Cleared by any call on this
+        # client that modifies the library. Returned lists are always the caller's own.
+        params = params or self._list_params()
+        if max_age <= 0:
+            resp, _ = self._first_listing_page(folder_name, params)
+            return list(self._iter_listing_pages(resp))
+
+        key = (folder_name.strip("/"), params.get("$select"))
+        cached = self._listing_cache.get(key)
+        if cached and time.time() - cached[0] < max_age:
+            return copy.deepcopy(cached[1])
+
+        resp, fell_back = self._first_listing_page(folder_name, params)
+        items = list(self._iter_listing_pages(resp))
+        # A missing folder falls back to the root listing; don't store that under its name
+        if not fell_back:
+            self._listing_cache[key] = (time.time(), copy.deepcopy(items))
+        return items
+
+    def _first_listing_page(self, folder_name="", params=None):
+        # Returns (response, fell_back_to_root)
+        self._refresh_if_needed()
+        params = params or self._list_params()
+        root_url = f"{self._drive_url}/root/children"
+        if not folder_name.strip():
+            return self.session.get(root_url, params=params), False
+
+        encoded = quote(folder_name.strip("/"))
+        resp = self.session.get(f"{self._root_path_url}/{encoded}:/children", params=params)
+        if resp.status_code != 200:
+            print(f"Folder '{folder_name}' not found. Listing root instead.")
+            return self.session.get(root_url, params=params), True
+        return resp, False
+
+    def _iter_listing_pages(self, resp):
+        while True:
+            resp.raise_for_status()
+            page = resp.json()
+            yield from page.get("value", [])
+            next_url = page.get("@odata.nextLink")
+            if not next_url:
+                break
+            # nextLink already carries the $select/$top query
+            resp = self.session.get(next_url)
+
+    def _graph_batch(self, requests_list):
+        """Send up to BATCH_LIMIT sub-requests in one JSON batch; return the responses keyed by id."""
+        resp = self.session.post(f"{GRAPH_URL}/$batch", json={"requests": requests_list})
+        resp.raise_for_status()
+        return {r["id"]: r for r in resp.json()["responses"]}
+
     # -------------------------
     # Public methods
     # -------------------------
-    def list_folder(self, folder_name=""):
-        """List files/folders inside the given folder (default = root)."""
-        if not folder_name.strip():
-            url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root/children"
-        else:
-            encoded = requests.utils.quote(folder_name.strip("/"))
-            folder_url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{encoded}"
-            resp = requests.get(folder_url, headers=self.headers)
-            if resp.status_code != 200:
-                print(f"Folder '{folder_name}' not found. Listing root instead.")
-                url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root/children"
-            else:
-                folder_item = resp.json()
-                url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/items/{folder_item['id']}/children"
-        return requests.get(url, headers=self.headers).json()
+    def iter_folder(self, folder_name="", select=None):
+        """
+        Yield the files/folders inside the given folder (default = root), following paging links.
+
+        select: item fields to return. Defaults to DEFAULT_SELECT (id, name, webUrl, size, file,
+                folder, parentReference, createdDateTime, lastModifiedDateTime and
+                @microsoft.graph.downloadUrl). Pass a list of Graph field names for others
+                (e.g. ["id", "name", "eTag"]) or "*" for Graph's full item payload.
+        """
+        resp, _ = self._first_listing_page(folder_name, self._list_params(select))
+        yield from self._iter_listing_pages(resp)
+
+    def list_folder(self, folder_name="", select=None):
+        """List files/folders inside the given folder (default = root). See iter_folder for `select`."""
+        return {"value": list(self.iter_folder(folder_name, select))}
 
     def print_folder(self, folder_name=""):
         """Pretty-print contents of a folder."""
@@ -151,74 +326,122 @@ class SharePointClient:
 
         folder_path: path relative to the library root (e.g. "HCM Audit/Archive/2025")
         """
+        self._refresh_if_needed()
+        self._listing_cache.clear()
         parts = folder_path.strip("/").split("/")
-        current_path = ""
-
-        created_folder = None
-        for part in parts:
-            current_path = f"{current_path}/{part}" if current_path else part
-            encoded_path = requests.utils.quote(current_path)
-
-            # Check if it already exists
-            url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{encoded_path}"
-            resp = requests.get(url, headers=self.headers)
-
-            if resp.status_code == 200:
-                # Folder already exists
-                created_folder = resp.json()
-                continue
-
-            # Otherwise create it under its parent
-            parent_path = "/".join(current_path.split("/")[:-1])
-            if parent_path:
-                parent_encoded = requests.utils.quote(parent_path)
-                create_url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{parent_encoded}:/children"
-            else:
-                create_url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root/children"
-
-            body = {
-                "name": part,
-                "folder": {},
-                "@microsoft.graph.conflictBehavior": "fail"
-            }
-            resp = requests.post(create_url, headers=self.headers, json=body)
-            resp.raise_for_status()
-            created_folder = resp.json()
-            print(f"📁 Created folder: {current_path}")
+        paths = ["/".join(parts[:i + 1]) for i in range(len(parts))]
+        encoded_parts = [quote(part) for part in parts]
+        encoded_paths = ["/".join(encoded_parts[:i + 1]) for i in range(len(parts))]
+
+        # Check which levels already exist (one batched round-trip per 20 levels)
+        existing = {}
+        for offset in range(0, len(paths), self.BATCH_LIMIT):
+            existing.update(self._graph_batch([
+                {
+                    "id": str(i),
+                    "method": "GET",
+                    "url": f"/drives/{self.drive_id}/root:/{encoded_paths[i]}"
+                }
+                for i in range(offset, min(offset + self.BATCH_LIMIT, len(paths)))
+            ]))
+
+        first_missing = len(paths)
+        for i in range(len(paths)):
+            status = existing[str(i)]["status"]
+            if status == 404:
+                first_missing = i
+                break
+            if status != 200:
+                raise Exception(f"Failed to look up folder '{paths[i]}': {existing[str(i)].get('body')}")
+
+        created_folder = existing[str(first_missing - 1)]["body"] if first_missing else None
+
+        # Create the missing levels, each one depending on its parent's creation
+        for offset in range(first_missing, len(paths), self.BATCH_LIMIT):
+            batch = []
+            for i in range(offset, min(offset + self.BATCH_LIMIT, len(paths))):
+                if i:
+                    create_url = f"/drives/{self.drive_id}/root:/{encoded_paths[i - 1]}:/children"
+                else:
+                    create_url = f"/drives/{self.drive_id}/root/children"
+                entry = {
+                    "id": str(i),
+                    "method": "POST",
+                    "url": create_url,
+                    "headers": {"Content-Type": "application/json"},
+                    "body": {
+                        "name": parts[i],
+                        "folder": {},
+                        "@microsoft.graph.conflictBehavior": "fail"
+                    }
+                }
+                if i > offset:
+                    entry["dependsOn"] = [str(i - 1)]
+                batch.append(entry)
+
+            responses = self._graph_batch(batch)
+            for entry in batch:
+                result = responses[entry["id"]]
+                if result["status"] not in (200, 201):
+                    raise Exception(f"Failed to create folder '{paths[int(entry['id'])]}': {result.get('body')}")
+                created_folder = result["body"]
+                print(f"📁 Created folder: {paths[int(entry['id'])]}")
 
         return created_folder
 
-    def get_files(self, folder_name=""):
+    def get_files(self, folder_name="", max_age=0, select=None):
         """
         Return a list of file metadata objects in the given folder.
-        Each object includes id, name, webUrl, size, lastModifiedDateTime, etc.
+        Each object includes the DEFAULT_SELECT fields (id, name, webUrl, size, file, folder,
+        parentReference, createdDateTime, lastModifiedDateTime, @microsoft.graph.downloadUrl).
+
+        max_age: reuse this client's listing of the folder if it is younger than
+                 this many seconds (e.g. after get_folders), instead of fetching it again
+        select:  item fields to return instead, as for iter_folder ("file"/"folder" are always added)
         """
-        children = self.list_folder(folder_name)
-        return [item for item in children.get("value", []) if "file" in item]
+        params = self._list_params(select, required=("file", "folder"))
+        return [item for item in self._list_folder_cached(folder_name, max_age, params) if "file" in item]
 
-    def get_folders(self, folder_name=""):
+    def get_folders(self, folder_name="", max_age=0, select=None):
         """
-        Return a list of folder metadata objects in the given folder.
+        Return a list of folder metadata objects in the given folder (same fields as get_files).
+
+        max_age: reuse this client's listing of the folder if it is younger than
+                 this many seconds (e.g. after get_files), instead of fetching it again
+        select:  item fields to return instead, as for iter_folder ("file"/"folder" are always added)
         """
-        children = self.list_folder(folder_name)
-        return [item for item in children.get("value", []) if "folder" in item]
+        params = self._list_params(select, required=("file", "folder"))
+        return [item for item in self._list_folder_cached(folder_name, max_age, params) if "folder" in item]
+
 
+    def download_files(self, folder_name="", download_dir="downloads", max_workers=8):
+        """
+        Download all files in a folder to `download_dir`, `max_workers` at a time.
 
-    def download_files(self, folder_name="", download_dir="downloads"):
-        """Download all files in a folder to `download_dir`."""
+        Stops at the first failed download: queued downloads are cancelled, the ones
+        already in progress are allowed to finish, and the error is re-raised.
+        """
+        self._refresh_if_needed()
         os.makedirs(download_dir, exist_ok=True)
-        children = self.list_folder(folder_name)
-        for item in children.get("value", []):
-            if "file" in item:
-                url = item["@microsoft.graph.downloadUrl"]
-                local_path = os.path.join(download_dir, item["name"])
+        items = [item for item in self.iter_folder(folder_name) if "file" in item]
+        print_lock = threading.Lock()
+
+        def download_one(item):
+            local_path = os.path.join(download_dir, item["name"])
+            with print_lock:
                 print(f"⬇ Downloading {item['name']} ...")
-                resp = requests.get(url)
-                resp.raise_for_status()
-                with open(local_path, "wb") as f:
-                    f.write(resp.content)
+            self._stream_to_file(item["@microsoft.graph.downloadUrl"], local_path)
+            with print_lock:
                 print(f"✅ Saved to {local_path}")
 
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(download_one, item) for item in items]
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((future for future in done if future.exception()), None)
+            if failed:
+                pool.shutdown(wait=False, cancel_futures=True)
+                failed.result()
+
     def download_file(self, file_path, download_dir="downloads", new_name=None):
         """
         Download a single file from SharePoint.
@@ -228,14 +451,15 @@ class SharePointClient:
         download_dir: local folder to save into (default "downloads")
         new_name: optional new filename for saving locally
         """
+        self._refresh_if_needed()
         os.makedirs(download_dir, exist_ok=True)
         if isinstance(file_path, dict) and "webUrl" in file_path:
             file_path = file_path["webUrl"]
 
         # Resolve the file item
-        encoded_path = requests.utils.quote(file_path.strip("/"))
-        url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{encoded_path}"
-        resp = requests.get(url, headers=self.headers)
+        encoded_path = quote(file_path.strip("/"))
+        url = f"{self._root_path_url}/{encoded_path}"
+        resp = self.session.get(url)
         resp.raise_for_status()
         file_item = resp.json()
 
@@ -251,11 +475,7 @@ class SharePointClient:
 
         # Download
         print(f"⬇ Downloading {file_item['name']} ...")
-        file_resp = requests.get(download_url)
-        file_resp.raise_for_status()
-
-        with open(local_path, "wb") as f:
-            f.write(file_resp.content)
+        self._stream_to_file(download_url, local_path)
 
         print(f"✅ Saved to {local_path}")
         return local_path
@@ -267,6 +487,8 @@ class SharePointClient:
         - If file <= 4MB, does simple PUT.
         - If file > 4MB, uses an upload session (chunked).
         """
+        self._refresh_if_needed()
+        self._listing_cache.clear()
         file_name = os.path.basename(local_path)
         folder_path = target_folder.strip("/")
         if folder_path:
@@ -277,34 +499,35 @@ class SharePointClient:
         file_size = os.path.getsize(local_path)
 
         if file_size <= 4 * 1024 * 1024:  # small file
-            url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{item_path}:/content"
+            url = f"{self._root_path_url}/{item_path}:/content"
             with open(local_path, "rb") as f:
-                resp = requests.put(url, headers=self.headers, data=f)
+                resp = self.session.put(url, data=f)
             resp.raise_for_status()
             print(f"✅ Uploaded small file: {item_path}")
             return resp.json()
 
         # Large file: use upload session
-        url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{item_path}:/createUploadSession"
-        session = requests.post(url, headers=self.headers, json={"item": {"@microsoft.graph.conflictBehavior": "replace"}})
-        session.raise_for_status()
-        upload_url = session.json()["uploadUrl"]
-
-        with open(local_path, "rb") as f:
-            i = 0
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                start = i * chunk_size
-                end = start + len(chunk) - 1
+        url = f"{self._root_path_url}/{item_path}:/createUploadSession"
+        upload_session = self.session.post(url, json={"item": {"@microsoft.graph.conflictBehavior": "replace"}})
+        upload_session.raise_for_status()
+        upload_url = upload_session.json()["uploadUrl"]
+
+        # Graph rejects out-of-order fragments, so PUTs stay sequential. Chunks are
+        # memoryview slices of an mmap, so the OS pages them straight into the socket.
+        with open(local_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            for start in range(0, file_size, chunk_size):
+                end = min(start + chunk_size, file_size) - 1
                 headers = {
-                    "Content-Length": str(len(chunk)),
+                    "Authorization": None,  # upload URLs reject the bearer token
+                    "Content-Length": str(end - start + 1),
                     "Content-Range": f"bytes {start}-{end}/{file_size}"
                 }
-                resp = requests.put(upload_url, headers=headers, data=chunk)
+                # Release each slice so the mmap can be closed afterwards
+                with view[start:end + 1] as chunk:
+                    resp = self.session.put(upload_url, headers=headers, data=chunk)
                 resp.raise_for_status()
-                i += 1
 
         print(f"✅ Uploaded large file: {item_path}")
         return resp.json()
@@ -316,30 +539,24 @@ class SharePointClient:
         file_path: path to the file relative to the drive root (e.g. "HR/Payroll/report.xlsx")
         target_folder: target folder path relative to root (e.g. "HR/Archive")
         """
-        # Get the file item first
-        encoded_path = requests.utils.quote(file_path.strip("/"))
-        url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{encoded_path}"
-        resp = requests.get(url, headers=self.headers)
-        resp.raise_for_status()
-        file_item = resp.json()
-        file_id = file_item["id"]
-
-        # Resolve target folder
-        encoded_target = requests.utils.quote(target_folder.strip("/"))
-        folder_url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{encoded_target}"
-        resp = requests.get(folder_url, headers=self.headers)
+        self._refresh_if_needed()
+        self._listing_cache.clear()
+        # Resolve target folder (Graph only accepts the parent by id)
+        encoded_target = quote(target_folder.strip("/"))
+        folder_url = f"{self._root_path_url}/{encoded_target}"
+        resp = self.session.get(folder_url)
         resp.raise_for_status()
-        folder_item = resp.json()
-        folder_id = folder_item["id"]
+        folder_id = resp.json()["id"]
 
-        # Issue PATCH to move
-        patch_url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/items/{file_id}"
+        # PATCH the file by path to move it
+        encoded_path = quote(file_path.strip("/"))
+        patch_url = f"{self._root_path_url}/{encoded_path}"
         body = {
             "parentReference": {
                 "id": folder_id
             }
         }
-        move_resp = requests.patch(patch_url, headers=self.headers, json=body)
+        move_resp = self.session.patch(patch_url, json=body)
         move_resp.raise_for_status()
 
         print(f"✅ Moved '{file_path}' → '{target_folder}/'")
@@ -353,18 +570,13 @@ class SharePointClient:
                    (e.g. "HCM Audit/250711 - HCM Audit Findings.xlsx")
         new_name:  new filename (just the name, not a path, e.g. "Findings_2025.xlsx")
         """
-        # Resolve the file item
-        encoded_path = requests.utils.quote(file_path.strip("/"))
-        url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{encoded_path}"
-        resp = requests.get(url, headers=self.headers)
-        resp.raise_for_status()
-        file_item = resp.json()
-        file_id = file_item["id"]
-
-        # Rename via PATCH
-        patch_url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/items/{file_id}"
+        self._refresh_if_needed()
+        self._listing_cache.clear()
+        # Rename via PATCH, addressing the file by path
+        encoded_path = quote(file_path.strip("/"))
+        patch_url = f"{self._root_path_url}/{encoded_path}"
         body = {"name": new_name}
-        rename_resp = requests.patch(patch_url, headers=self.headers, json=body)
+        rename_resp = self.session.patch(patch_url, json=body)
         rename_resp.raise_for_status()
 
         print(f"✅ Renamed '{file_path}' → '{new_name}'")
@@ -377,19 +589,14 @@ class SharePointClient:
         file_path: path to the file relative to the library root
                    (e.g. "HR/Payroll/report.xlsx")
         """
-        # Resolve the file item first
-        encoded_path = requests.utils.quote(file_path.strip("/"))
-        url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/root:/{encoded_path}"
-        resp = requests.get(url, headers=self.headers)
-        if resp.status_code == 404:
+        self._refresh_if_needed()
+        self._listing_cache.clear()
+        # Issue DELETE request, addressing the file by path
+        encoded_path = quote(file_path.strip("/"))
+        delete_url = f"{self._root_path_url}/{encoded_path}"
+        del_resp = self.session.delete(delete_url)
+        if del_resp.status_code == 404:
             raise FileNotFoundError(f"File '{file_path}' not found in SharePoint.")
-        resp.raise_for_status()
-        file_item = resp.json()
-        file_id = file_item["id"]
-
-        # Issue DELETE request
-        delete_url = f"https://graph.microsoft.com/v1.0/drives/{self.drive_id}/items/{file_id}"
-        del_resp = requests.delete(delete_url, headers=self.headers)
 
         if del_resp.status_code in (204, 200):
             print(f"🗑️ Deleted file: {file_path}")